@@ -13,23 +13,461 @@ UX improvements:
 - URL field clears itself on Enter (kept exactly as implemented)
 - Automatic execution once file or URL is provided
 - Removed Run Analysis button
+- Pages are OCR'd and interpreted concurrently with live status updates
 """
+import hashlib
 import os
+import queue
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Iterable
 import requests
 import streamlit as st
 
 from text_extractor import TextExtractor
-from openai_client import Interpreter
+from openai_client import Interpreter, is_data_url
 from storage import Storage
+from config import AzureConfig
 from file_utils import (
     process_file,
-    image_to_png_bytes,
+    data_url_to_bytes,
+    image_to_data_url,
+    shrink_image,
     EmptyFileError,
     UnsupportedFileTypeError,
     FileTooLargeError,
     CorruptedFileError,
 )
 
+# Concurrency limits for per-page processing
+MAX_PAGE_WORKERS = 8
+MAX_CONCURRENT_OCR = 4
+# Rendered pages kept in flight ahead of the OCR workers
+MAX_PENDING_PAGES = 2 * MAX_PAGE_WORKERS
+# Unique pages summarized per OpenAI chat completion
+INTERPRET_BATCH_SIZE = 5
+# Summary jobs run in the background at once, shared by all sessions
+MAX_CONCURRENT_JOBS = 4
+# How often the script thread polls a running job for new summaries
+JOB_POLL_SECONDS = 0.25
+# Largest image sent inline as a data URL when Blob Storage is disabled;
+# bigger images are downscaled to fit
+MAX_INLINE_IMAGE_BYTES = 4 * 1024 * 1024
+# Total size of the inline data URLs sent in one OpenAI request
+MAX_INLINE_REQUEST_BYTES = 12 * 1024 * 1024
+
+_ocr_semaphore = threading.Semaphore(MAX_CONCURRENT_OCR)
+
+
+@st.cache_resource
+def _get_services() -> tuple[Storage, TextExtractor, Interpreter]:
+    """
+    Create the storage, OCR and OpenAI wrappers once per server process.
+
+    The underlying SDK clients are thread-safe, so the same instances are
+    shared across reruns and sessions.
+
+    Returns:
+        tuple[Storage, TextExtractor, Interpreter]: Shared service wrappers.
+    """
+    return Storage(), TextExtractor(), Interpreter()
+
+
+@st.cache_resource
+def _get_job_executor() -> ThreadPoolExecutor:
+    """
+    Create the background executor that runs summary jobs.
+
+    Shared across sessions, so at most MAX_CONCURRENT_JOBS documents are
+    processed at once while the Streamlit script threads stay free to
+    update the UI.
+
+    Returns:
+        ThreadPoolExecutor: Shared job executor.
+    """
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS,
+                              thread_name_prefix="summary-job")
+
+
+@st.cache_data(show_spinner=False)
+def _upload_file(file_bytes: bytes, extension: str | None,
+                 _storage: Storage) -> str:
+    """
+    Upload an uploaded image file to Azure Blob Storage.
+
+    PDFs are not uploaded; their rendered pages are uploaded one by one.
+
+    Cached by file content, so reruns on the same upload skip the
+    existence check and upload entirely.
+
+    Args:
+        file_bytes (bytes): Raw content of the uploaded file.
+        extension (str | None): File extension without the dot.
+        _storage (Storage): Shared storage client.
+
+    Returns:
+        str: URL of the uploaded blob.
+    """
+    return _storage.upload_bytes_and_get_url(file_bytes, extension=extension)
+
+
+@st.cache_data(show_spinner=False)
+def _ocr_page(img_bytes: bytes, _extractor: TextExtractor) -> dict:
+    """
+    Run OCR on a single page image and return the cleaned result.
+
+    Cached by image content, so reruns on the same file skip the Azure
+    Vision call. The extractor is excluded from the cache key.
+
+    Args:
+        img_bytes (bytes): Encoded page image.
+        _extractor (TextExtractor): Shared OCR extractor.
+
+    Returns:
+        dict: Cleaned OCR result with 'caption' and 'text_lines'.
+    """
+    with _ocr_semaphore:
+        ocr_result = _extractor.analyze_img(img_bytes)
+    return _extractor.cleaned_result(ocr_result)
+
+
+@st.cache_data(show_spinner=False)
+def _ocr_pdf(pdf_bytes: bytes, _extractor: TextExtractor) -> list[dict]:
+    """
+    Run OCR on every page of a PDF with a single Azure Read operation.
+
+    Cached by document content. The extractor is excluded from the
+    cache key.
+
+    Args:
+        pdf_bytes (bytes): Raw PDF content.
+        _extractor (TextExtractor): Shared OCR extractor.
+
+    Returns:
+        list[dict]: Cleaned OCR result per page, in page order.
+    """
+    return _extractor.analyze_pdf(pdf_bytes)
+
+
+@st.cache_data(show_spinner=False)
+def _interpret_batch(pages: list[tuple[dict, str]],
+                     _interpreter: Interpreter) -> list[str]:
+    """
+    Generate OpenAI summaries for a batch of cleaned pages.
+
+    The whole batch is summarized by a single chat completion. Cached by
+    OCR content and image URLs, so reruns skip the call. The interpreter
+    is excluded from the cache key.
+
+    Args:
+        pages (list[tuple[dict, str]]): (cleaned OCR result, image URL)
+            for each page in the batch.
+        _interpreter (Interpreter): Shared OpenAI interpreter.
+
+    Returns:
+        list[str]: One summary per page, in batch order.
+    """
+    return _interpreter.interpret_pages(pages)
+
+
+def _page_key(img_bytes: bytes) -> bytes:
+    """
+    Compute a content hash used to detect identical pages.
+
+    Repeated cover, separator or boilerplate pages only need to be OCR'd
+    and interpreted once.
+
+    Args:
+        img_bytes (bytes): Encoded page image.
+
+    Returns:
+        bytes: 16-byte blake2b digest of the page.
+    """
+    return hashlib.blake2b(img_bytes, digest_size=16).digest()
+
+
+@st.cache_data(show_spinner=False)
+def _upload_page(img_bytes: bytes, _storage: Storage,
+                 extension: str = "png") -> str:
+    """
+    Upload a page image to Azure Blob Storage.
+
+    Cached by image content, so identical pages and reruns reuse the
+    existing blob instead of uploading again. Page images are small, so
+    they are uploaded without a prior existence check, saving one
+    round-trip per page. Uploads run concurrently on the page workers.
+
+    Args:
+        img_bytes (bytes): Encoded page image.
+        _storage (Storage): Shared storage client.
+        extension (str): File extension of the image.
+
+    Returns:
+        str: URL of the uploaded page image.
+    """
+    return _storage.upload_bytes_and_get_url(
+        img_bytes, extension=extension, check_exists=False
+    )
+
+
+def _page_image_url(img_bytes: bytes, storage: Storage,
+                    extension: str = "png") -> str:
+    """
+    Resolve the URL under which OpenAI receives a page image.
+
+    With USE_BLOB_STORAGE disabled, images are embedded as data URLs,
+    skipping the upload round-trip. Images larger than
+    MAX_INLINE_IMAGE_BYTES are downscaled to fit first, since there is
+    no storage to upload them to.
+
+    Args:
+        img_bytes (bytes): Encoded page image.
+        storage (Storage): Shared storage client.
+        extension (str): File extension of the image.
+
+    Returns:
+        str: Data URL or blob URL of the page image.
+    """
+    if AzureConfig.USE_BLOB_STORAGE:
+        return _upload_page(img_bytes, storage, extension)
+    if len(img_bytes) > MAX_INLINE_IMAGE_BYTES:
+        img_bytes = shrink_image(img_bytes, MAX_INLINE_IMAGE_BYTES)
+        extension = "jpeg"
+    return image_to_data_url(img_bytes, extension)
+
+
+def _fit_inline_budget(keys: list[bytes], pages: list[tuple[dict, str]],
+                       storage: Storage
+                       ) -> list[tuple[list[bytes], list[tuple[dict, str]]]]:
+    """
+    Keep the inline images of each OpenAI request within budget.
+
+    Once a batch's data URLs would exceed MAX_INLINE_REQUEST_BYTES, the
+    remaining inline images are uploaded to Blob Storage. Without a
+    configured storage client, the batch is split into several requests
+    instead.
+
+    Args:
+        keys (list[bytes]): Page keys of the batch, in page order.
+        pages (list[tuple[dict, str]]): (cleaned OCR result, image URL)
+            for each page of the batch.
+        storage (Storage): Shared storage client for page uploads.
+
+    Returns:
+        list[tuple[list[bytes], list[tuple[dict, str]]]]: (page keys,
+        pages) for each request to send, in page order.
+    """
+    groups = [([], [])]
+    inline_bytes = 0
+    for key, (cleaned, url) in zip(keys, pages):
+        if is_data_url(url):
+            if inline_bytes + len(url) > MAX_INLINE_REQUEST_BYTES:
+                if storage.service_client is not None:
+                    img_bytes, extension = data_url_to_bytes(url)
+                    url = _upload_page(img_bytes, storage, extension)
+                else:
+                    groups.append(([], []))
+                    inline_bytes = 0
+            if is_data_url(url):
+                inline_bytes += len(url)
+        groups[-1][0].append(key)
+        groups[-1][1].append((cleaned, url))
+    return [group for group in groups if group[0]]
+
+
+def _prepare_page(idx: int, img_bytes: bytes, extractor: TextExtractor,
+                  storage: Storage, image_url: str | None,
+                  pdf_ocr: Future | None = None) -> tuple[int, dict, str]:
+    """
+    Run OCR for a single page and resolve the image URL passed to OpenAI.
+
+    Executed on a worker thread, so it must not render any Streamlit
+    elements. OCR calls are throttled by a shared semaphore to stay below
+    the Azure Vision request quota.
+
+    Rendered PDF pages get their own image URL (a PNG blob or an inline
+    data URL) so OpenAI receives the image of that page rather than the
+    URL of the whole PDF.
+
+    Args:
+        idx (int): 1-based page number.
+        img_bytes (bytes): Encoded page image.
+        extractor (TextExtractor): Shared OCR extractor.
+        storage (Storage): Shared storage client for page uploads.
+        image_url (str | None): URL of the uploaded image, or None for
+            rendered PDF pages that still need their own image URL.
+        pdf_ocr (Future | None): Pending whole-document OCR result. When
+            given, the page is taken from it with the default caption, so
+            the page costs no Vision call of its own. Pages missing from
+            the result, or all pages if the Read operation failed, are
+            analyzed on their own.
+
+    Returns:
+        tuple[int, dict, str]: (page number, cleaned OCR result, image URL)
+    """
+    if image_url is None:
+        image_url = _page_image_url(img_bytes, storage)
+
+    pdf_pages = []
+    if pdf_ocr is not None:
+        try:
+            pdf_pages = pdf_ocr.result()
+        except Exception:
+            # Fall back to per-page OCR if the Read operation failed
+            pdf_pages = []
+    if idx <= len(pdf_pages):
+        cleaned_page = pdf_pages[idx - 1]
+    else:
+        cleaned_page = _ocr_page(img_bytes, extractor)
+    return idx, cleaned_page, image_url
+
+
+def _summarize_pages(pages: Iterable[bytes], extractor: TextExtractor,
+                     interpreter: Interpreter, storage: Storage,
+                     image_url: str | None,
+                     on_pages_done: Callable[[dict[int, str]], None]
+                     | None = None,
+                     pdf_bytes: bytes | None = None,
+                     cancel_event: threading.Event | None = None
+                     ) -> dict[int, str]:
+    """
+    OCR and interpret pages concurrently as they are produced.
+
+    Pages are consumed lazily so rendering overlaps with OCR, and at most
+    MAX_PENDING_PAGES unique pages are held in flight at once. Duplicate
+    pages are not resubmitted and reuse the summary of their first copy.
+
+    Unique pages are interpreted in page-ordered batches of
+    INTERPRET_BATCH_SIZE, one chat completion per batch. Each batch is
+    submitted as soon as all of its pages are prepared, so summaries of
+    early pages overlap with OCR of later ones. Fixed batch boundaries
+    keep the interpretation cache effective across reruns.
+
+    Args:
+        pages (Iterable[bytes]): Encoded page images, in page order.
+        extractor (TextExtractor): Shared OCR extractor.
+        interpreter (Interpreter): Shared OpenAI interpreter.
+        storage (Storage): Shared storage client for page uploads.
+        image_url (str | None): URL of the uploaded image, or None for
+            rendered PDF pages.
+        on_pages_done (Callable[[dict[int, str]], None] | None): Called on
+            the thread running this function (the job executor in the
+            app) each time a batch finishes, with the summaries of the
+            newly finished pages, duplicates included. It must not render
+            Streamlit elements.
+        pdf_bytes (bytes | None): Source PDF. When given, all pages are
+            OCR'd by one Azure Read operation running alongside page
+            rendering and upload, instead of one request per page.
+        cancel_event (threading.Event | None): When set, queued work is
+            cancelled and no further pages are submitted.
+
+    Returns:
+        dict[int, str]: Page summary for every 1-based page number.
+
+    Raises:
+        CancelledError: If cancel_event was set before the job finished.
+    """
+    page_groups = {}
+    keys = []
+    prepared = {}
+    summaries_by_key = {}
+    in_flight = {}
+    batches = {}
+    next_batch = 0
+
+    def submit_ready_batches(executor, final):
+        # Only the last batch may be short, once all pages are known.
+        nonlocal next_batch
+        while next_batch < len(keys):
+            batch = keys[next_batch:next_batch + INTERPRET_BATCH_SIZE]
+            if len(batch) < INTERPRET_BATCH_SIZE and not final:
+                return
+            if any(key not in prepared for key in batch):
+                return
+            # Pop the pages so their OCR results and data URLs are freed
+            # once the batch is submitted
+            requests_to_send = _fit_inline_budget(
+                batch, [prepared.pop(key) for key in batch], storage
+            )
+            for request_keys, request_pages in requests_to_send:
+                future = executor.submit(_interpret_batch, request_pages,
+                                         interpreter)
+                batches[future] = request_keys
+            next_batch += len(batch)
+
+    def collect(futures):
+        for future in futures:
+            if future in in_flight:
+                key = in_flight.pop(future)
+                _, cleaned_page, page_url = future.result()
+                prepared[key] = (cleaned_page, page_url)
+                continue
+            batch = batches.pop(future)
+            summaries_by_key.update(zip(batch, future.result()))
+            if on_pages_done:
+                on_pages_done({
+                    idx: summaries_by_key[key]
+                    for key in batch
+                    for idx in page_groups[key]
+                })
+
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise CancelledError("Summary cancelled")
+
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor, \
+            ThreadPoolExecutor(max_workers=1) as pdf_executor:
+        pdf_ocr = None
+        if pdf_bytes is not None:
+            pdf_ocr = pdf_executor.submit(_ocr_pdf, pdf_bytes, extractor)
+
+        try:
+            for idx, img_bytes in enumerate(pages, start=1):
+                check_cancelled()
+                key = _page_key(img_bytes)
+                if key in page_groups:
+                    page_groups[key].append(idx)
+                    continue
+                page_groups[key] = [idx]
+                keys.append(key)
+
+                collect([f for f in [*in_flight, *batches] if f.done()])
+                while len(in_flight) >= MAX_PENDING_PAGES:
+                    done, _ = wait([*in_flight, *batches],
+                                   return_when=FIRST_COMPLETED)
+                    collect(done)
+                submit_ready_batches(executor, final=False)
+                future = executor.submit(_prepare_page, idx, img_bytes,
+                                         extractor, storage, image_url,
+                                         pdf_ocr)
+                in_flight[future] = key
+
+            submit_ready_batches(executor, final=True)
+            while in_flight or batches:
+                done, _ = wait([*in_flight, *batches],
+                               return_when=FIRST_COMPLETED)
+                check_cancelled()
+                collect(done)
+                submit_ready_batches(executor, final=True)
+        except BaseException:
+            # Leaving the with block waits for queued work, so drop it
+            # before the error propagates instead of finishing every call.
+            for future in [*in_flight, *batches]:
+                future.cancel()
+            raise
+
+    return {
+        idx: summaries_by_key[key]
+        for key, page_numbers in page_groups.items()
+        for idx in page_numbers
+    }
+
 
 def main():
     """
@@ -38,7 +476,7 @@ def main():
     Responsibilities:
     - Render sidebar widgets
     - Validate inputs
-    - Upload files to Azure Blob Storage
+    - Upload images and rendered PDF pages to Azure Blob Storage
     - Run OCR on all pages
     - Generate cleaned text for OpenAI interpretation
     - Display multi-page summary
@@ -64,54 +502,78 @@ def main():
             st.error("No valid file.")
             return
 
-        # Upload to Azure Blob Storage
-        with st.spinner("Uploading file to Azure Blob Storage..."):
-            storage = Storage()
-            blob_url = storage.upload_bytes_and_get_url(
-                file_bytes,
-                extension=original_extension or None
-            )
-
-        st.session_state.blob_url = blob_url
-        st.success(f"Uploaded successfully: {blob_url}")
+        storage, extractor, interpreter = _get_services()
 
         # Process file and extract OCR
         st.info("Processing file...")
         processed = process_file(file_bytes)
-        pages = processed if isinstance(processed, list) else [processed]
-
-        extractor = TextExtractor()
-        cleaned_pages = []
-
-        for idx, page in enumerate(pages, start=1):
-            st.write(f"OCR on page {idx}...")
-
-            if isinstance(page, bytes):
-                img_bytes = page
-            else:
-                img_bytes = image_to_png_bytes(page)
-
-            ocr_result = extractor.analyze_img(img_bytes)
-            cleaned_pages.append(extractor.cleaned_result(ocr_result))
+        is_pdf = not isinstance(processed, bytes)
+        pages = processed if is_pdf else [processed]
+        if is_pdf:
+            # Each rendered page gets its own image URL, so the PDF itself
+            # is never uploaded.
+            image_url = None
+        elif AzureConfig.USE_BLOB_STORAGE:
+            with st.spinner("Uploading file to Azure Blob Storage..."):
+                image_url = _upload_file(
+                    file_bytes, original_extension or None, storage
+                )
 
-        # Generate summary
-        st.info("Generating summary using OpenAI...")
-        interpreter = Interpreter()
-        summary = ""
-
-        for idx, cleaned_page in enumerate(cleaned_pages, start=1):
-            st.write(f"Interpreting page {idx}...")
+            st.session_state.blob_url = image_url
+            st.success(f"Uploaded successfully: {image_url}")
+        else:
+            image_url = _page_image_url(file_bytes, storage,
+                                        original_extension or "png")
 
-            system, prompt = interpreter.build_interpretation_prompt(
-                cleaned_page,
-                image_url=st.session_state.blob_url
-            )
+        # OCR + summary per unique page runs as a background job, fanned out
+        # over a bounded thread pool while later pages are still rendering.
+        # The script thread polls the job and shows summaries in page order.
+        status = st.status("Running OCR and generating summary using "
+                           "OpenAI...")
+        st.subheader("Summary")
+        summary_container = st.container()
+        ready = {}
+        next_page = 1
 
-            page_summary = interpreter.interpret_data(system, prompt)
-            summary += f"\n\n### Page {idx}\n{page_summary}"
+        def show_pages(finished: dict[int, str]):
+            nonlocal next_page
+            ready.update(finished)
+            while next_page in ready:
+                summary_container.markdown(
+                    f"### Page {next_page}\n{ready.pop(next_page)}"
+                )
+                next_page += 1
+            status.update(label=f"Summarized {next_page - 1} pages")
 
-        st.subheader("Summary")
-        st.write(summary)
+        updates = queue.Queue()
+        cancel_event = threading.Event()
+        job = _get_job_executor().submit(
+            _summarize_pages,
+            pages, extractor, interpreter, storage, image_url,
+            on_pages_done=updates.put,
+            pdf_bytes=file_bytes if is_pdf else None,
+            cancel_event=cancel_event
+        )
+        try:
+            while not (job.done() and updates.empty()):
+                try:
+                    show_pages(updates.get(timeout=JOB_POLL_SECONDS))
+                except queue.Empty:
+                    # Streamlit only handles Stop and reruns inside st
+                    # calls, so touch the status on every tick.
+                    status.update(
+                        label=f"Summarized {next_page - 1} pages"
+                    )
+            try:
+                job.result()
+            except Exception:
+                status.update(label="Summary failed", state="error")
+                raise
+        finally:
+            # Stops remaining work if this script run is interrupted,
+            # e.g. by a new upload or the user pressing Stop.
+            cancel_event.set()
+        status.update(label="Summary ready", state="complete")
 
     except (EmptyFileError, UnsupportedFileTypeError,
             FileTooLargeError, CorruptedFileError) as e:
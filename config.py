@@ -10,20 +10,56 @@ Handles centralized configuration management for Azure services:
 Provides:
 - Environment variable loading
 - Credentials validation
-- Client initialization
+- Client initialization, cached so each client is created once per process
+  (SDK packages are imported on first use to keep start-up fast; failed
+  initializations are retried on the next call)
 - Full configuration check
 """
+import functools
 import os
+import threading
 from dotenv import load_dotenv
-from azure.ai.vision.imageanalysis import ImageAnalysisClient
 from azure.core.exceptions import AzureError, HttpResponseError
 from azure.core.credentials import AzureKeyCredential
-from azure.storage.blob import BlobServiceClient
-from openai import AzureOpenAI
 
 load_dotenv()
 
 
+def _cache_client(factory):
+    """
+    Cache the client returned by `factory` once it is created successfully.
+
+    Unlike functools.lru_cache, a None returned by a failed initialization
+    is not cached, so a missing setting or transient error is retried on
+    the next call.
+
+    Args:
+        factory (Callable[[], object | None]): Client getter to wrap.
+
+    Returns:
+        Callable[[], object | None]: Getter returning the cached client,
+        with a `cache_clear()` method to drop it.
+    """
+    client = None
+    lock = threading.Lock()
+
+    @functools.wraps(factory)
+    def get_client():
+        nonlocal client
+        if client is None:
+            with lock:
+                if client is None:
+                    client = factory()
+        return client
+
+    def cache_clear():
+        nonlocal client
+        client = None
+
+    get_client.cache_clear = cache_clear
+    return get_client
+
+
 class AzureConfig:
     """
     Centralized Azure Configuration and Client Manager.
@@ -50,6 +86,9 @@ class AzureConfig:
     BLOB_NAME = os.getenv("BLOB_NAME")
     CONTAINER_NAME = os.getenv("CONTAINER_NAME")
 
+    # When false, small page images are sent to OpenAI inline as data URLs
+    USE_BLOB_STORAGE = os.getenv("USE_BLOB_STORAGE", "true").lower() != "false"
+
     @staticmethod
     def validate_computer_vision_config():
         """
@@ -128,6 +167,7 @@ class AzureConfig:
         return True
     
     @staticmethod
+    @_cache_client
     def get_computer_vision_client():
         """
         Initializes and returns an Azure Computer Vision client.
@@ -135,17 +175,25 @@ class AzureConfig:
         The method validates the configuration first. If initialization fails,
         the exception is caught and printed, and None is returned.
 
+        The client is thread-safe and cached, so every caller shares one
+        instance and its connection pool. Failed initializations are not
+        cached.
+
         Returns:
             ImageAnalysisClient | None: Initialized client instance, 
             or None if initialization fails.
         """
+        from azure.ai.vision.imageanalysis import ImageAnalysisClient
+
         try:
             AzureConfig.validate_computer_vision_config()
             endpoint = AzureConfig.COMPUTER_VISION_ENDPOINT
             credential = AzureKeyCredential(AzureConfig.COMPUTER_VISION_KEY)
+            # Retries are left to azure_retry, which also rate-limits them
             client = ImageAnalysisClient(
                 endpoint=endpoint, 
-                credential=credential
+                credential=credential,
+                retry_total=0
                 )
             return client
         except ValueError as e:
@@ -157,6 +205,7 @@ class AzureConfig:
         return None
 
     @staticmethod
+    @_cache_client
     def get_openai_client():
         """
         Initializes and returns an Azure OpenAI client.
@@ -164,17 +213,25 @@ class AzureConfig:
         The method validates the configuration first. If initialization fails,
         the exception is caught and printed, and None is returned.
 
+        The client is thread-safe and cached, so every caller shares one
+        instance and its connection pool. Failed initializations are not
+        cached.
+
         Returns:
             AzureOpenAIClient | None: Initialized client instance, 
             or None if initialization fails.
         """
+        from openai import AzureOpenAI
+
         try:
             AzureConfig.validate_openai_config()
             client = AzureOpenAI(
                 api_key=AzureConfig.OPENAI_KEY,
                 azure_endpoint=AzureConfig.OPENAI_ENDPOINT,
                 azure_deployment=AzureConfig.OPENAI_DEPLOYMENT,
-                api_version="2024-12-01-preview"
+                api_version="2024-12-01-preview",
+                # Retries are left to azure_retry
+                max_retries=0
             )
             return client
         except ValueError as e:
@@ -186,6 +243,7 @@ class AzureConfig:
         return None
              
     @staticmethod
+    @_cache_client
     def get_blob_service_client():
         """
         Initializes and returns an Blob Service client.
@@ -193,10 +251,16 @@ class AzureConfig:
         The method validates the configuration first. If initialization fails,
         the exception is caught and printed, and None is returned.
 
+        The client is thread-safe and cached, so every caller shares one
+        instance and its connection pool. Failed initializations are not
+        cached.
+
         Returns:
             BlobServiceClient | None: Initialized client instance, 
             or None if initialization fails.
         """
+        from azure.storage.blob import BlobServiceClient
+
         try:
             endpoint = AzureConfig.AZURE_STORAGE_ENDPOINT
             blob_credential = AzureConfig.AZURE_STORAGE_KEY
@@ -7,12 +7,16 @@ Provides:
 - Custom exceptions for empty or unsupported files
 - File type detection for PDFs and images
 - Centralized file validation for supported formats
-- Conversion of PDF pages to images (conversion only, no validation)
+- Encoding of images as base64 data URLs, and shrinking them to fit
+  size limits
+- Lazy, page-by-page conversion of PDF pages to PNG images
+  (conversion only, no validation)
 """
+import base64
 import io
-from typing import List, Union
+import mimetypes
+from typing import Iterator, List, Union
 from PIL import Image, UnidentifiedImageError
-import fitz
 
 # Azure file size constraints
 AZURE_MAX_IMAGE_WIDTH = 10000
@@ -20,6 +24,23 @@ AZURE_MAX_IMAGE_HEIGHT = 10000
 AZURE_MAX_FILE_MB = 500
 AZURE_MAX_PDF_PAGES = 2000
 
+# JPEG quality used when an image is shrunk to fit a size limit
+SHRINK_JPEG_QUALITY = 85
+
+# Leading bytes of common image formats, checked before falling back to PIL
+IMAGE_SIGNATURES = (
+    b"\x89PNG\r\n\x1a\n",  # PNG
+    b"\xff\xd8\xff",  # JPEG
+    b"II*\x00",  # TIFF, little-endian
+    b"MM\x00*",  # TIFF, big-endian
+    b"GIF87a",  # GIF
+    b"GIF89a",  # GIF
+)
+
+# "BM" alone is too common a prefix, so BMP files must also carry a known
+# DIB header size (bytes 14-17, little-endian)
+BMP_DIB_HEADER_SIZES = frozenset({12, 40, 52, 56, 64, 108, 124})
+
 
 class CorruptedFileError(Exception):
     """
@@ -62,6 +83,9 @@ def detect_file_type(file_bytes: bytes) -> str:
     """
     Detect the type of a file from its bytes content.
 
+    Common formats are recognized from their magic bytes without decoding
+    the file. Integrity is checked later by validate_file().
+
     Supported file types:
     - PDF
     - Image (any format supported by Pillow)
@@ -82,6 +106,14 @@ def detect_file_type(file_bytes: bytes) -> str:
     if file_bytes.startswith(b"%PDF"):
         return "pdf"
 
+    if (file_bytes.startswith(IMAGE_SIGNATURES) or
+       (file_bytes[:4] == b"RIFF" and file_bytes[8:12] == b"WEBP") or
+       (file_bytes[:2] == b"BM" and
+            int.from_bytes(file_bytes[14:18], "little")
+            in BMP_DIB_HEADER_SIZES)):
+        return "image"
+
+    # Less common formats: let Pillow identify them
     try:
         with Image.open(io.BytesIO(file_bytes)) as img:
             img.verify()
@@ -120,6 +152,8 @@ def validate_file(file_bytes: bytes, file_type: str):
         )
 
     if file_type == "pdf":
+        import fitz
+
         try:
             doc = fitz.open(stream=file_bytes, filetype="pdf")
         except Exception as e:
@@ -133,13 +167,16 @@ def validate_file(file_bytes: bytes, file_type: str):
                 f"{AZURE_MAX_PDF_PAGES}."
             )
 
-        # Validate every page's dimensions BEFORE conversion
+        # Validate every page's dimensions BEFORE conversion. Sizes are
+        # computed from the page rectangle (1 pt = 1 px at 72 DPI), so no
+        # page has to be rendered just to be measured.
         for idx, page in enumerate(doc):
-            pix = page.get_pixmap(alpha=False)
-            if (pix.width > AZURE_MAX_IMAGE_WIDTH or
-               pix.height > AZURE_MAX_IMAGE_HEIGHT):
+            width = round(page.rect.width)
+            height = round(page.rect.height)
+            if (width > AZURE_MAX_IMAGE_WIDTH or
+               height > AZURE_MAX_IMAGE_HEIGHT):
                 raise FileTooLargeError(
-                    f"PDF page {idx} renders to {pix.width}x{pix.height}, "
+                    f"PDF page {idx} renders to {width}x{height}, "
                     f"which exceeds max allowed "
                     f"{AZURE_MAX_IMAGE_WIDTH}x{AZURE_MAX_IMAGE_HEIGHT}."
                 )
@@ -165,36 +202,80 @@ def validate_file(file_bytes: bytes, file_type: str):
         raise UnsupportedFileTypeError("Unsupported format.")
 
 
-def image_to_png_bytes(img: Image.Image) -> bytes:
+def image_to_data_url(img_bytes: bytes, extension: str = "png") -> str:
+    """
+    Encode image bytes as a base64 data URL.
+
+    Args:
+        img_bytes (bytes): Encoded image.
+        extension (str): Image file extension used to pick the MIME type.
+
+    Returns:
+        str: 'data:<mime>;base64,...' URL.
+    """
+    mime_type = mimetypes.types_map.get(
+        f".{extension.lstrip('.').lower()}", "image/png"
+    )
+    encoded = base64.b64encode(img_bytes).decode("ascii")
+    return f"data:{mime_type};base64,{encoded}"
+
+
+def data_url_to_bytes(data_url: str) -> tuple[bytes, str]:
     """
-    Convert a PIL Image to PNG bytes.
+    Decode a base64 data URL created by image_to_data_url.
 
     Args:
-        img (PIL.Image.Image): The image to convert.
+        data_url (str): 'data:<mime>;base64,...' URL.
 
     Returns:
-        bytes: Encoded PNG bytes.
+        tuple[bytes, str]: (decoded image bytes, file extension)
     """
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    return buffer.getvalue()
+    header, encoded = data_url.split(",", 1)
+    mime_type = header[len("data:"):].split(";", 1)[0]
+    extension = mimetypes.guess_extension(mime_type) or ".png"
+    return base64.b64decode(encoded), extension.lstrip(".")
 
 
-def process_file(file_bytes: bytes) -> Union[bytes, List[Image.Image]]:
+def shrink_image(img_bytes: bytes, max_bytes: int) -> bytes:
+    """
+    Downscale an image until its JPEG encoding fits within max_bytes.
+
+    Args:
+        img_bytes (bytes): Encoded image.
+        max_bytes (int): Maximum size of the result.
+
+    Returns:
+        bytes: JPEG-encoded, downscaled image.
+    """
+    with Image.open(io.BytesIO(img_bytes)) as img:
+        img = img.convert("RGB")
+    scale = min(1.0, (max_bytes / len(img_bytes)) ** 0.5)
+    while True:
+        size = (max(1, int(img.width * scale)),
+                max(1, int(img.height * scale)))
+        buffer = io.BytesIO()
+        img.resize(size).save(buffer, format="JPEG",
+                              quality=SHRINK_JPEG_QUALITY)
+        if buffer.tell() <= max_bytes or size == (1, 1):
+            return buffer.getvalue()
+        scale *= 0.75
+
+
+def process_file(file_bytes: bytes) -> Union[bytes, Iterator[bytes]]:
     """
     Detects, validates, and converts uploaded files to a format suitable
     for OCR.
 
-    PDF → list of PIL images
+    PDF → iterator of PNG bytes, one per page, rendered on demand
     Image → return bytes (unchanged)
 
     Args:
         file_bytes (bytes): Raw content of the file.
 
     Returns:
-        bytes | List[PIL.Image.Image]:
+        bytes | Iterator[bytes]:
             - Raw image bytes if input was an image
-            - List of PIL Images if input was a PDF
+            - Lazy iterator of PNG page images if input was a PDF
 
     Raises:
         EmptyFileError, UnsupportedFileTypeError,
@@ -204,54 +285,83 @@ def process_file(file_bytes: bytes) -> Union[bytes, List[Image.Image]]:
     validate_file(file_bytes, file_type)
 
     if file_type == "pdf":
-        return pdf_bytes_to_images(file_bytes)
+        return iter_pdf_page_images(file_bytes)
 
     return file_bytes
 
 
-def pdf_bytes_to_images(
+def iter_pdf_page_images(
     pdf_bytes: bytes,
     dpi: int = 150,
     max_width: int = 1200
-     ) -> List[Image.Image]:
+     ) -> Iterator[bytes]:
     """
-    Convert validated PDF bytes to a list of PIL images.
+    Lazily render validated PDF bytes to PNG-encoded page images.
 
     NOTE:
     All validation has already occurred in validate_file().
     This function ONLY performs conversion.
 
+    Pages are rendered one at a time as the iterator is consumed, so only
+    the pages currently in use are held in memory. Pages wider than
+    `max_width` are rendered directly at a reduced zoom instead of being
+    resized afterwards.
+
     Args:
         pdf_bytes (bytes): Raw PDF content.
         dpi (int): Rendering resolution.
-        max_width (int): Optional resize threshold for memory efficiency.
+        max_width (int): Maximum rendered page width in pixels.
 
-    Returns:
-        List[PIL.Image.Image]: One image per PDF page.
+    Yields:
+        bytes: One PNG image per PDF page.
 
     Raises:
         CorruptedFileError: If PDF cannot be opened.
     """
+    import fitz
+
     try:
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
     except Exception as e:
         raise CorruptedFileError("PDF appears corrupted.") from e
 
-    images = []
+    # Most pages share the same zoom; only oversized pages need their own
+    zoom = dpi / 72
+    default_matrix = fitz.Matrix(zoom, zoom)
 
-    for page in doc:
-        zoom = dpi / 72
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
+    try:
+        for page in doc:
+            if page.rect.width * zoom <= max_width:
+                mat = default_matrix
+            else:
+                page_zoom = max_width / page.rect.width
+                mat = fitz.Matrix(page_zoom, page_zoom)
+            pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB,
+                                  alpha=False)
+            yield pix.tobytes("png")
+    finally:
+        doc.close()
+
+
+def pdf_bytes_to_images(
+    pdf_bytes: bytes,
+    dpi: int = 150,
+    max_width: int = 1200
+     ) -> List[bytes]:
+    """
+    Convert validated PDF bytes to a list of PNG-encoded page images.
 
-        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    Eager variant of iter_pdf_page_images().
 
-        # Resize oversized images for performance
-        if img.width > max_width:
-            ratio = max_width / img.width
-            new_height = int(img.height * ratio)
-            img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+    Args:
+        pdf_bytes (bytes): Raw PDF content.
+        dpi (int): Rendering resolution.
+        max_width (int): Maximum rendered page width in pixels.
 
-        images.append(img)
+    Returns:
+        List[bytes]: One PNG image per PDF page.
 
-    return images
+    Raises:
+        CorruptedFileError: If PDF cannot be opened.
+    """
+    return list(iter_pdf_page_images(pdf_bytes, dpi, max_width))
@@ -2,9 +2,69 @@
 OpenAI Interpreter for Chart and Text Analysis
 
 Wraps Azure OpenAI API calls to produce structured summaries from image OCR
-and captions.
+and captions. Several pages can be summarized with a single chat completion.
 """
+import re
 from config import AzureConfig
+from retry_utils import azure_retry
+
+# Output token budget for the summary of one page
+MAX_TOKENS_PER_PAGE = 800
+
+# Fixed system prompts, built once at import time
+SYSTEM_MESSAGE = (
+    "You are a helpful data-analysis assistant.\n"
+    "Your input consists of:\n"
+    "1. OCR text extracted from an image\n"
+    "2. A URL pointing to the image itself\n\n"
+    "Your task is to:\n"
+    "- interpret both the visual content (from URL) and the OCR text\n"
+    "- produce a structured, factual summary\n"
+    "- Do NOT hallucinate values that aren't present in the data"
+)
+
+BATCH_SYSTEM_MESSAGE = SYSTEM_MESSAGE + (
+    "\n\nThe input contains several pages, each starting with a "
+    "'# Page N' heading. Summarize every page separately, in order, "
+    "starting each summary with the heading '### Page N' on its own line."
+)
+
+# Matches only bare '## Page N' or '### Page N' heading lines, so prose
+# such as '**Page 2 of the report**' never splits a summary; pages whose
+# heading drifts from this fall back to their own chat completion
+_PAGE_HEADING = re.compile(r"^#{2,3} Page (\d+)\s*$", re.MULTILINE)
+
+
+def is_data_url(image_url: str) -> bool:
+    """
+    Check whether an image URL carries the image inline as a data URL.
+
+    Inline images are sent to OpenAI as image content parts instead of
+    being written into the prompt text.
+
+    Args:
+        image_url (str): Blob URL or data URL of a page image.
+
+    Returns:
+        bool: True for 'data:' URLs.
+    """
+    return image_url.startswith("data:")
+
+
+def _page_fields(cleaned: dict) -> tuple[str, str]:
+    """
+    Extract the caption and OCR text shared by all prompt builders.
+
+    Args:
+        cleaned (dict): Dictionary with keys 'caption' and 'text_lines'.
+
+    Returns:
+        tuple[str, str]: (caption, newline-joined OCR text), with defaults
+        for missing values.
+    """
+    caption = cleaned.get("caption", "No caption detected")
+    text = "\n".join(cleaned.get("text_lines", ["No text detected"]))
+    return caption, text
 
 
 class Interpreter:
@@ -30,50 +90,151 @@ class Interpreter:
         Returns:
             tuple[str, str]: (system_message, user_prompt)
         """
-        caption = cleaned.get("caption", "No caption detected")
-        text = "\n".join(cleaned.get("text_lines", ["No text detected"]))
-
-        system_message = (
-            "You are a helpful data-analysis assistant.\n"
-            "Your input consists of:\n"
-            "1. OCR text extracted from an image\n"
-            "2. A URL pointing to the image itself\n\n"
-            "Your task is to:\n"
-            "- interpret both the visual content (from URL) and the OCR text\n"
-            "- produce a structured, factual summary\n"
-            "- Do NOT hallucinate values that aren't present in the data"
-        )
+        caption, text = _page_fields(cleaned)
+        if is_data_url(image_url):
+            image_line = "Image: attached"
+        else:
+            image_line = f"Image URL: {image_url}"
 
         prompt = (
             f"Caption: {caption}\n"
             f"Text: {text}\n"
-            f"Image URL: {image_url}\n\n"
+            f"{image_line}\n\n"
             "Use both the OCR text and visual information from the image URL "
             "to create a factual summary."
         )
 
-        return system_message, prompt
+        return SYSTEM_MESSAGE, prompt
+
+    def build_batch_interpretation_prompt(
+            self, pages: list[tuple[dict, str]]) -> tuple[str, str]:
+        """
+        Builds a single system message and user prompt covering several
+        pages, so they can be summarized with one chat completion.
+
+        Pages are numbered from 1 in the order given, and the model is
+        asked to answer with one '### Page N' section per page. Inline
+        (data URL) images are referred to by their attachment order.
+
+        Args:
+            pages (list[tuple[dict, str]]): (cleaned OCR result, image URL)
+                for each page.
+
+        Returns:
+            tuple[str, str]: (system_message, user_prompt)
+        """
+        sections = []
+        attached = 0
+        for number, (cleaned, image_url) in enumerate(pages, start=1):
+            caption, text = _page_fields(cleaned)
+            if is_data_url(image_url):
+                attached += 1
+                image_line = f"Image: attached image {attached}"
+            else:
+                image_line = f"Image URL: {image_url}"
+            sections.append(
+                f"# Page {number}\n"
+                f"Caption: {caption}\n"
+                f"Text: {text}\n"
+                f"{image_line}"
+            )
+
+        prompt = (
+            "\n\n".join(sections) + "\n\n"
+            "For each page, use both the OCR text and visual information "
+            "from the image URL to create a factual summary."
+        )
+
+        return BATCH_SYSTEM_MESSAGE, prompt
+
+    def interpret_pages(self, pages: list[tuple[dict, str]]) -> list[str]:
+        """
+        Summarizes several pages with a single chat completion.
+
+        The response is split on its '### Page N' headings. Pages missing
+        from the response are summarized individually as a fallback.
+
+        Args:
+            pages (list[tuple[dict, str]]): (cleaned OCR result, image URL)
+                for each page.
+
+        Returns:
+            list[str]: One summary per page, in the order given.
+        """
+        if len(pages) == 1:
+            return [self._interpret_page(*pages[0])]
+
+        system, prompt = self.build_batch_interpretation_prompt(pages)
+        content = self.interpret_data(
+            system, prompt, max_tokens=MAX_TOKENS_PER_PAGE * len(pages),
+            images=[url for _, url in pages if is_data_url(url)]
+        )
+
+        sections = {}
+        headings = list(_PAGE_HEADING.finditer(content or ""))
+        for heading, next_heading in zip(headings, headings[1:] + [None]):
+            end = next_heading.start() if next_heading else len(content)
+            section = content[heading.end():end].strip()
+            sections[int(heading.group(1))] = section
+
+        summaries = []
+        for number, (cleaned, image_url) in enumerate(pages, start=1):
+            if number not in sections:
+                sections[number] = self._interpret_page(cleaned, image_url)
+            summaries.append(sections[number])
+        return summaries
 
-    def interpret_data(self, system_message: str, prompt: str) -> str:
+    def _interpret_page(self, cleaned: dict, image_url: str) -> str:
+        """
+        Summarizes a single page with its own chat completion.
+
+        Args:
+            cleaned (dict): Cleaned OCR result for the page.
+            image_url (str): Blob URL or data URL of the page image.
+
+        Returns:
+            str: Page summary.
+        """
+        system, prompt = self.build_interpretation_prompt(cleaned, image_url)
+        images = [image_url] if is_data_url(image_url) else None
+        return self.interpret_data(system, prompt, images=images)
+
+    @azure_retry
+    def interpret_data(self, system_message: str, prompt: str,
+                       max_tokens: int = MAX_TOKENS_PER_PAGE,
+                       images: list[str] | None = None) -> str:
         """
         Sends the system message and user prompt to Azure OpenAI
         chat completion and retrieves the summary.
 
+        Rate-limit and transient server errors are retried with
+        exponential backoff.
+
         Args:
             system_message (str): System-level instructions for the model.
             prompt (str): User-level content containing OCR text and image URL.
+            max_tokens (int): Maximum number of tokens in the response.
+            images (list[str] | None): Image URLs (typically data URLs) to
+                attach to the user message as image content parts.
 
         Returns:
             str: Generated summary text from OpenAI.
         """
+        user_content = prompt
+        if images:
+            user_content = [{"type": "text", "text": prompt}] + [
+                {"type": "image_url", "image_url": {"url": url}}
+                for url in images
+            ]
+
         response = self.client.chat.completions.create(
             model=AzureConfig.OPENAI_DEPLOYMENT,
             messages=[
                 {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": user_content}
             ],
             temperature=0.3,
-            max_tokens=800
+            max_tokens=max_tokens
         )
         content = response.choices[0].message.content
         return content
@@ -0,0 +1,115 @@
+"""
+Retry Utilities Module
+
+Handles transient failures and request throttling for Azure service calls.
+
+Provides:
+- Classification of rate-limit and transient server errors
+- Exponential-backoff retry decorator for Azure Vision and OpenAI calls
+- Thread-safe token-bucket rate limiter shared across worker threads
+"""
+import sys
+import threading
+import time
+import requests
+from azure.core.exceptions import HttpResponseError
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+# Retry policy for transient Azure failures
+RETRY_MAX_ATTEMPTS = 3
+RETRY_MIN_WAIT_SECONDS = 1
+RETRY_MAX_WAIT_SECONDS = 30
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Decide whether an exception raised by an Azure call is worth retrying.
+
+    Retries rate limiting (HTTP 429 or a "rate limit"/"quota" message),
+    server-side 5xx errors and dropped connections. Client errors such as
+    bad credentials or invalid input are not retried.
+
+    Args:
+        exc (BaseException): Exception raised by the Azure SDK, OpenAI or
+            a REST call made with requests.
+
+    Returns:
+        bool: True if the call should be retried.
+    """
+    # openai is imported lazily by the client factory; if it has not been
+    # imported yet, the exception cannot come from it.
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(
+            exc, (openai.RateLimitError, openai.InternalServerError,
+                  openai.APITimeoutError)):
+        return True
+
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status_code = exc.response.status_code
+        return status_code == 429 or status_code >= 500
+
+    if isinstance(exc, HttpResponseError):
+        status_code = exc.status_code or 0
+        if status_code == 429 or status_code >= 500:
+            return True
+        message = str(exc).lower()
+        return "rate limit" in message or "quota" in message
+
+    return False
+
+
+azure_retry = retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential(min=RETRY_MIN_WAIT_SECONDS,
+                          max=RETRY_MAX_WAIT_SECONDS),
+    stop=stop_after_attempt(RETRY_MAX_ATTEMPTS),
+    reraise=True,
+)
+
+
+class RateLimiter:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each call to `acquire` consumes one token, blocking until one is
+    available.
+    """
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate (float): Maximum sustained requests per second.
+            capacity (int | None): Maximum burst size. Defaults to `rate`.
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
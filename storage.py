@@ -5,10 +5,11 @@ Provides simplified upload and access methods for user-uploaded files.
 
 Responsibilities:
 - Initialize BlobServiceClient for the configured storage account
-- Upload bytes and automatically generate blob names
+- Upload bytes under content-addressed blob names, skipping duplicates
 - Return accessible blob URLs suitable for OpenAI completions
 """
-import uuid
+import hashlib
+from azure.core.exceptions import ResourceExistsError
 from config import AzureConfig
 
 
@@ -21,39 +22,57 @@ class Storage:
     def __init__(self):
         self.service_client = AzureConfig.get_blob_service_client()
 
-    def _generate_uuid_name(self, extension: str | None) -> str:
+    def _generate_content_name(self, file_bytes: bytes,
+                               extension: str | None) -> str:
         """
-        Generates a UUID-based blob filename.
+        Generates a blob filename from a hash of the file content.
+
+        Identical content always maps to the same blob, so repeated uploads
+        can be detected and skipped.
 
         Args:
+            file_bytes (bytes): Content to be uploaded.
             extension (str | None): Optional file extension (e.g., 'png').
 
         Returns:
             str: Generated filename.
         """
+        digest = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
         ext = f".{extension.lstrip('.')}" if extension else ""
-        return f"{uuid.uuid4()}{ext}"
+        return f"{digest}{ext}"
 
     def upload_bytes_and_get_url(self, file_bytes: bytes,
-                                 extension: str | None = None) -> str:
+                                 extension: str | None = None,
+                                 check_exists: bool = True) -> str:
         """
-        Uploads bytes to Azure Blob Storage with a UUID-based filename and
-        returns the accessible URL.
+        Uploads bytes to Azure Blob Storage with a content-addressed
+        filename and returns the accessible URL.
+
+        If a blob with the same content already exists, the upload is
+        skipped and the existing blob URL is returned.
 
         Args:
             file_bytes (bytes): Content to upload.
             extension (str | None): Optional extension without the dot
                 (e.g., 'png', 'jpg', 'pdf').
+            check_exists (bool): Look the blob up before uploading. Worth
+                the extra round-trip for large files; small files can be
+                uploaded directly and rejected by the service if present.
 
         Returns:
             str: Public URL of uploaded blob.
         """
-        filename = self._generate_uuid_name(extension)
+        filename = self._generate_content_name(file_bytes, extension)
 
         client = self.service_client.get_blob_client(
             container=AzureConfig.CONTAINER_NAME,
             blob=filename
         )
 
-        client.upload_blob(file_bytes, overwrite=True)
+        if not check_exists or not client.exists():
+            try:
+                client.upload_blob(file_bytes, overwrite=False)
+            except ResourceExistsError:
+                # Already uploaded, possibly by a concurrent request
+                pass
         return client.url
@@ -3,26 +3,45 @@ Unit Tests for AI Report Summarizer
 
 """
 from unittest.mock import patch, MagicMock
+from concurrent.futures import CancelledError, Future
 from types import SimpleNamespace
 import unittest
 import io
+import os
+import threading
+import time
 import pytest
+import fitz
 from PIL import Image
 
 from file_utils import (
     detect_file_type,
     validate_file,
     process_file,
+    pdf_bytes_to_images,
+    shrink_image,
     EmptyFileError,
     UnsupportedFileTypeError,
     FileTooLargeError,
     CorruptedFileError,
-    AZURE_MAX_FILE_MB
+    AZURE_MAX_FILE_MB,
+    AZURE_MAX_IMAGE_WIDTH,
 )
 from storage import Storage
 from text_extractor import TextExtractor
 from openai_client import Interpreter
 import config
+from app import (
+    MAX_PAGE_WORKERS,
+    _fit_inline_budget,
+    _prepare_page,
+    _ocr_page,
+    _upload_page,
+    _page_image_url,
+    _summarize_pages,
+)
+from retry_utils import is_transient_error
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
 
 
 class TestApp(unittest.TestCase):
@@ -36,6 +55,18 @@ class TestApp(unittest.TestCase):
         Image.new("RGB", (10, 10), "red").save(buf, "PNG")
         assert detect_file_type(buf.getvalue()) == "image"
 
+    @patch("file_utils.Image.open")
+    def test_detect_file_type_from_magic_bytes(self, mock_open):
+        assert detect_file_type(b"\xFF\xD8\xFF\xE0" + b"data") == "image"
+        assert detect_file_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image"
+        bmp_header = b"BM" + b"\x00" * 12 + (40).to_bytes(4, "little")
+        assert detect_file_type(bmp_header) == "image"
+        mock_open.assert_not_called()
+
+    def test_detect_file_type_rejects_text_starting_with_bm(self):
+        with pytest.raises(UnsupportedFileTypeError):
+            detect_file_type(b"BMW service report, page 1")
+
     def test_detect_file_type_empty(self):
         with pytest.raises(EmptyFileError):
             detect_file_type(b"")
@@ -49,11 +80,25 @@ class TestApp(unittest.TestCase):
         with pytest.raises(FileTooLargeError):
             validate_file(large_bytes, "image")
 
-    @patch("file_utils.fitz.open", side_effect=Exception("corrupted PDF"))
+    @patch("fitz.open", side_effect=Exception("corrupted PDF"))
     def test_validate_file_pdf_corrupted(self, _):
         with pytest.raises(CorruptedFileError):
             validate_file(b"%PDF-1.4\n...", "pdf")
 
+    def test_validate_file_pdf_page_too_large(self):
+        doc = fitz.open()
+        doc.new_page(width=AZURE_MAX_IMAGE_WIDTH + 100, height=100)
+        with pytest.raises(FileTooLargeError):
+            validate_file(doc.tobytes(), "pdf")
+
+    def test_pdf_pages_are_capped_at_max_width(self):
+        doc = fitz.open()
+        doc.new_page(width=200, height=100)
+        doc.new_page(width=2000, height=100)
+        narrow, wide = pdf_bytes_to_images(doc.tobytes(), max_width=1000)
+        assert Image.open(io.BytesIO(narrow)).width == round(200 * 150 / 72)
+        assert Image.open(io.BytesIO(wide)).width == 1000
+
     def test_validate_file_jpg_corrupted(self):
         with pytest.raises(CorruptedFileError):
             validate_file(b"\xFF\xD8\xFF\xE0" + b"invalid data", "image")
@@ -63,17 +108,18 @@ class TestApp(unittest.TestCase):
         Image.new("RGB", (10, 10)).save(buf, "PNG")
         assert isinstance(process_file(buf.getvalue()), bytes)
 
-    def test_process_file_pdf_returns_list(self):
+    def test_process_file_pdf_returns_png_pages(self):
         sample_pdf_path = "tests/sample.pdf"
         with open(sample_pdf_path, "rb") as f:
-            images = process_file(f.read())
-        assert isinstance(images, list)
-        assert all(isinstance(img, Image.Image) for img in images)
+            images = list(process_file(f.read()))
+        assert images
+        assert all(img.startswith(b"\x89PNG") for img in images)
 
     @patch.object(config.AzureConfig, "get_blob_service_client")
     def test_upload_bytes_and_get_url(self, mock_get_client):
         mock_blob_client = MagicMock()
         mock_blob_client.url = "https://fake.blob/url"
+        mock_blob_client.exists.return_value = False
         mock_service_client = MagicMock()
         mock_service_client.get_blob_client.return_value = mock_blob_client
         mock_get_client.return_value = mock_service_client
@@ -81,10 +127,50 @@ class TestApp(unittest.TestCase):
         storage = Storage()
         url = storage.upload_bytes_and_get_url(b"dummy", extension="png")
         mock_blob_client.upload_blob.assert_called_once_with(
-            b"dummy", overwrite=True
+            b"dummy", overwrite=False
             )
         assert url == "https://fake.blob/url"
 
+    @patch.object(config.AzureConfig, "get_blob_service_client")
+    def test_upload_bytes_without_exists_check(self, mock_get_client):
+        mock_blob_client = MagicMock()
+        mock_blob_client.upload_blob.side_effect = ResourceExistsError()
+        mock_service_client = MagicMock()
+        mock_service_client.get_blob_client.return_value = mock_blob_client
+        mock_get_client.return_value = mock_service_client
+
+        Storage().upload_bytes_and_get_url(b"dummy", check_exists=False)
+        mock_blob_client.exists.assert_not_called()
+        mock_blob_client.upload_blob.assert_called_once()
+
+    @patch.object(config.AzureConfig, "get_blob_service_client")
+    def test_upload_bytes_skips_existing_content(self, mock_get_client):
+        mock_blob_client = MagicMock()
+        mock_blob_client.url = "https://fake.blob/url"
+        mock_blob_client.exists.return_value = True
+        mock_service_client = MagicMock()
+        mock_service_client.get_blob_client.return_value = mock_blob_client
+        mock_get_client.return_value = mock_service_client
+
+        storage = Storage()
+        first = storage.upload_bytes_and_get_url(b"dummy", extension="png")
+        second = storage.upload_bytes_and_get_url(b"dummy", extension="png")
+        names = [
+            call.kwargs["blob"]
+            for call in mock_service_client.get_blob_client.call_args_list
+        ]
+        mock_blob_client.upload_blob.assert_not_called()
+        assert first == second == "https://fake.blob/url"
+        assert names[0] == names[1] and names[0].endswith(".png")
+
+    @patch("text_extractor.AzureConfig.get_computer_vision_client")
+    def test_extractor_creates_client_lazily(self, mock_get_client):
+        extractor = TextExtractor()
+        mock_get_client.assert_not_called()
+        assert extractor.client is mock_get_client.return_value
+        assert extractor.client is mock_get_client.return_value
+        mock_get_client.assert_called_once()
+
     def test_cleaned_result_with_caption_and_text(self):
         extractor = TextExtractor()
         result = SimpleNamespace(
@@ -117,3 +203,378 @@ class TestApp(unittest.TestCase):
         inter = Interpreter()
         result = inter.interpret_data("sys", "prompt")
         assert result == "summary text"
+
+    @patch("openai_client.AzureConfig.get_openai_client")
+    def test_build_interpretation_prompt(self, _):
+        system, prompt = Interpreter().build_interpretation_prompt(
+            {"caption": "a chart", "text_lines": ["first", "second"]},
+            "https://page/1.png"
+        )
+        assert system.startswith("You are a helpful data-analysis")
+        assert prompt == (
+            "Caption: a chart\n"
+            "Text: first\nsecond\n"
+            "Image URL: https://page/1.png\n\n"
+            "Use both the OCR text and visual information from the image "
+            "URL to create a factual summary."
+        )
+
+    def test_prepare_page_returns_ocr_and_url(self):
+        _ocr_page.clear()
+        extractor = MagicMock()
+        extractor.cleaned_result.return_value = {
+            "caption": "c", "text_lines": ["t"]
+        }
+        storage = MagicMock()
+
+        result = _prepare_page(
+            3, b"img", extractor, storage, "https://fake.blob/url"
+        )
+        extractor.analyze_img.assert_called_once_with(b"img")
+        storage.upload_bytes_and_get_url.assert_not_called()
+        assert result == (
+            3, {"caption": "c", "text_lines": ["t"]}, "https://fake.blob/url"
+        )
+
+    def test_prepare_page_uploads_rendered_pdf_page(self):
+        _ocr_page.clear()
+        _upload_page.clear()
+        extractor = MagicMock()
+        extractor.cleaned_result.return_value = {
+            "caption": "c", "text_lines": ["t"]
+        }
+        storage = MagicMock()
+        storage.upload_bytes_and_get_url.return_value = "https://page/1.png"
+
+        _, _, url = _prepare_page(1, b"page png", extractor, storage, None)
+        storage.upload_bytes_and_get_url.assert_called_once_with(
+            b"page png", extension="png", check_exists=False
+        )
+        assert url == "https://page/1.png"
+
+    def test_is_transient_error(self):
+        throttled = HttpResponseError(message="Too many requests")
+        throttled.status_code = 429
+        bad_request = HttpResponseError(message="Invalid image")
+        bad_request.status_code = 400
+        assert is_transient_error(throttled)
+        assert not is_transient_error(bad_request)
+        assert not is_transient_error(ValueError("boom"))
+
+    @patch("time.sleep")
+    @patch("openai_client.AzureConfig.get_openai_client")
+    def test_interpret_data_retries_rate_limit(self, mock_get_client, _):
+        throttled = HttpResponseError(message="Rate limit exceeded")
+        throttled.status_code = 429
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = [
+            throttled,
+            MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+        ]
+        mock_get_client.return_value = mock_client
+
+        inter = Interpreter()
+        assert inter.interpret_data("sys", "prompt") == "ok"
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_ocr_page_is_cached_by_content(self):
+        _ocr_page.clear()
+        extractor = MagicMock()
+        extractor.cleaned_result.return_value = {
+            "caption": "c", "text_lines": ["t"]
+        }
+        first = _ocr_page(b"same page", extractor)
+        second = _ocr_page(b"same page", extractor)
+        assert first == second
+        extractor.analyze_img.assert_called_once_with(b"same page")
+
+    @patch("app._interpret_batch")
+    @patch("app._prepare_page")
+    def test_summarize_pages_skips_duplicate_pages(self, mock_prepare,
+                                                   mock_interpret):
+        mock_prepare.side_effect = (
+            lambda idx, img_bytes, *_: (idx, {"text": img_bytes}, "url")
+        )
+        mock_interpret.side_effect = lambda pages, _: [
+            f"summary of {cleaned['text']}" for cleaned, _ in pages
+        ]
+        pages = iter([b"blank", b"chart", b"blank"])
+        finished = {}
+        summaries = _summarize_pages(
+            pages, MagicMock(), MagicMock(), MagicMock(), None,
+            on_pages_done=finished.update
+        )
+        assert mock_prepare.call_count == 2
+        mock_interpret.assert_called_once()
+        assert summaries == {
+            1: "summary of b'blank'",
+            2: "summary of b'chart'",
+            3: "summary of b'blank'",
+        }
+        assert finished == summaries
+
+    @patch("app._interpret_batch")
+    @patch("app._prepare_page")
+    def test_summarize_pages_interprets_batches_before_ocr_finishes(
+            self, mock_prepare, mock_interpret):
+        first_batch_started = threading.Event()
+
+        def prepare(idx, img_bytes, *_):
+            if idx == 6:
+                assert first_batch_started.wait(timeout=5)
+            return idx, {"text": img_bytes}, "url"
+
+        def interpret(pages, _):
+            first_batch_started.set()
+            return [f"summary of {cleaned['text']}" for cleaned, _ in pages]
+
+        mock_prepare.side_effect = prepare
+        mock_interpret.side_effect = interpret
+        pages = iter([f"page {i}".encode() for i in range(1, 7)])
+        summaries = _summarize_pages(
+            pages, MagicMock(), MagicMock(), MagicMock(), None
+        )
+        assert mock_interpret.call_count == 2
+        assert summaries[6] == "summary of b'page 6'"
+
+    @patch("app._prepare_page")
+    def test_summarize_pages_cancels_queued_work_on_error(self,
+                                                          mock_prepare):
+        calls = []
+
+        def prepare(idx, *_):
+            calls.append(idx)
+            if idx == 1:
+                time.sleep(0.1)
+                raise RuntimeError("OCR failed")
+            time.sleep(0.2)
+            return idx, {}, "url"
+
+        mock_prepare.side_effect = prepare
+        pages = iter([f"page {i}".encode() for i in range(1, 41)])
+        with pytest.raises(RuntimeError):
+            _summarize_pages(pages, MagicMock(), MagicMock(), MagicMock(),
+                             None)
+        # Only pages already running on a worker may still finish
+        assert len(calls) <= MAX_PAGE_WORKERS + 1
+
+    @patch("text_extractor.time.sleep")
+    @patch("text_extractor.requests.get")
+    @patch("text_extractor.requests.post")
+    def test_analyze_pdf_polls_single_read_operation(self, mock_post,
+                                                      mock_get, _):
+        mock_post.return_value = MagicMock(
+            headers={"Operation-Location": "https://fake/read/op"}
+        )
+        mock_get.return_value.json.side_effect = [
+            {"status": "running"},
+            {"status": "succeeded", "analyzeResult": {"readResults": [
+                {"page": 2, "lines": []},
+                {"page": 1, "lines": [{"text": "hello"}]},
+            ]}},
+        ]
+        with patch.object(config.AzureConfig, "COMPUTER_VISION_ENDPOINT",
+                          "https://fake.vision/"), \
+                patch.object(config.AzureConfig, "COMPUTER_VISION_KEY",
+                             "fake-key"):
+            pages = TextExtractor().analyze_pdf(b"%PDF-1.4")
+
+        mock_post.assert_called_once()
+        assert mock_get.call_count == 2
+        assert pages[0]["text_lines"] == ["hello"]
+        assert pages[1]["text_lines"] == ["No text lines detected"]
+
+    def test_prepare_page_uses_pdf_ocr_result(self):
+        extractor = MagicMock()
+        pdf_ocr = Future()
+        pdf_ocr.set_result([
+            {"caption": "No Caption detected", "text_lines": ["first"]},
+            {"caption": "No Caption detected", "text_lines": ["second"]},
+        ])
+
+        _, cleaned, _ = _prepare_page(2, b"page png", extractor, MagicMock(),
+                                      "https://page/2.png", pdf_ocr)
+        extractor.analyze_img.assert_not_called()
+        assert cleaned == {
+            "caption": "No Caption detected", "text_lines": ["second"]
+        }
+
+    def test_prepare_page_ocrs_page_when_pdf_read_fails(self):
+        _ocr_page.clear()
+        extractor = MagicMock()
+        extractor.cleaned_result.return_value = {
+            "caption": "c", "text_lines": ["t"]
+        }
+        pdf_ocr = Future()
+        pdf_ocr.set_exception(RuntimeError("Azure Read operation failed"))
+
+        _, cleaned, _ = _prepare_page(1, b"page one", extractor, MagicMock(),
+                                      "https://page/1.png", pdf_ocr)
+        extractor.analyze_img.assert_called_once_with(b"page one")
+        assert cleaned == {"caption": "c", "text_lines": ["t"]}
+
+    def test_prepare_page_ocrs_pages_missing_from_pdf_result(self):
+        _ocr_page.clear()
+        extractor = MagicMock()
+        extractor.cleaned_result.return_value = {
+            "caption": "c", "text_lines": ["t"]
+        }
+        pdf_ocr = Future()
+        pdf_ocr.set_result([{"caption": "c", "text_lines": ["first"]}])
+
+        _, cleaned, _ = _prepare_page(2, b"page two", extractor, MagicMock(),
+                                      "https://page/2.png", pdf_ocr)
+        extractor.analyze_img.assert_called_once_with(b"page two")
+        assert cleaned == {"caption": "c", "text_lines": ["t"]}
+
+    @patch("openai_client.AzureConfig.get_openai_client")
+    def test_interpret_pages_splits_single_completion(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(
+                content="### Page 1\nfirst summary\n\n"
+                        "### Page 2\nsecond summary"
+            ))]
+        )
+        mock_get_client.return_value = mock_client
+
+        inter = Interpreter()
+        summaries = inter.interpret_pages([
+            ({"caption": "a", "text_lines": ["x"]}, "https://page/1.png"),
+            ({"caption": "b", "text_lines": ["y"]}, "https://page/2.png"),
+        ])
+        assert summaries == ["first summary", "second summary"]
+        mock_client.chat.completions.create.assert_called_once()
+
+    @patch("openai_client.AzureConfig.get_openai_client")
+    def test_interpret_pages_ignores_loose_headings(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = [
+            MagicMock(choices=[MagicMock(message=MagicMock(
+                content="## Page 1\nfirst summary\n"
+                        "**Page 2 of the report** is cited\n\n"
+                        "## Page 2:\nloose heading"
+            ))]),
+            MagicMock(choices=[MagicMock(message=MagicMock(
+                content="second summary"
+            ))]),
+        ]
+        mock_get_client.return_value = mock_client
+
+        summaries = Interpreter().interpret_pages([
+            ({"caption": "a", "text_lines": ["x"]}, "https://page/1.png"),
+            ({"caption": "b", "text_lines": ["y"]}, "https://page/2.png"),
+        ])
+        assert summaries == [
+            "first summary\n**Page 2 of the report** is cited\n\n"
+            "## Page 2:\nloose heading",
+            "second summary",
+        ]
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_openai_client_is_created_once(self):
+        config.AzureConfig.get_openai_client.cache_clear()
+        with patch.object(config.AzureConfig, "OPENAI_ENDPOINT",
+                          "https://fake.openai/"), \
+                patch.object(config.AzureConfig, "OPENAI_KEY", "fake-key"), \
+                patch("openai.AzureOpenAI") as mock_openai:
+            first = config.AzureConfig.get_openai_client()
+            second = config.AzureConfig.get_openai_client()
+        config.AzureConfig.get_openai_client.cache_clear()
+        assert first is second
+        mock_openai.assert_called_once()
+        assert mock_openai.call_args.kwargs["max_retries"] == 0
+
+    def test_failed_client_initialization_is_retried(self):
+        config.AzureConfig.get_openai_client.cache_clear()
+        with patch.object(config.AzureConfig, "OPENAI_ENDPOINT", None), \
+                patch.object(config.AzureConfig, "OPENAI_KEY", None):
+            assert config.AzureConfig.get_openai_client() is None
+        with patch.object(config.AzureConfig, "OPENAI_ENDPOINT",
+                          "https://fake.openai/"), \
+                patch.object(config.AzureConfig, "OPENAI_KEY", "fake-key"), \
+                patch("openai.AzureOpenAI") as mock_openai:
+            client = config.AzureConfig.get_openai_client()
+        config.AzureConfig.get_openai_client.cache_clear()
+        assert client is mock_openai.return_value
+
+    def test_page_image_url_inlines_when_blob_storage_disabled(self):
+        storage = MagicMock()
+        with patch.object(config.AzureConfig, "USE_BLOB_STORAGE", False):
+            url = _page_image_url(b"png bytes", storage)
+        storage.upload_bytes_and_get_url.assert_not_called()
+        assert url == "data:image/png;base64,cG5nIGJ5dGVz"
+
+    def test_shrink_image_fits_size_limit(self):
+        buf = io.BytesIO()
+        Image.frombytes("RGB", (300, 300), os.urandom(300 * 300 * 3)).save(
+            buf, "PNG"
+        )
+        shrunk = shrink_image(buf.getvalue(), 5000)
+        assert len(shrunk) <= 5000
+        assert Image.open(io.BytesIO(shrunk)).format == "JPEG"
+
+    @patch("app.shrink_image", return_value=b"small")
+    def test_page_image_url_shrinks_large_inline_image(self, mock_shrink):
+        storage = MagicMock()
+        with patch.object(config.AzureConfig, "USE_BLOB_STORAGE", False), \
+                patch("app.MAX_INLINE_IMAGE_BYTES", 4):
+            url = _page_image_url(b"large png", storage)
+        mock_shrink.assert_called_once_with(b"large png", 4)
+        storage.upload_bytes_and_get_url.assert_not_called()
+        assert url == "data:image/jpeg;base64,c21hbGw="
+
+    def test_fit_inline_budget_uploads_images_over_budget(self):
+        _upload_page.clear()
+        storage = MagicMock()
+        storage.upload_bytes_and_get_url.return_value = "https://page/2.png"
+        pages = [({"text_lines": [str(i)]}, "data:image/png;base64,cG5n")
+                 for i in range(2)]
+        with patch("app.MAX_INLINE_REQUEST_BYTES", 30):
+            groups = _fit_inline_budget([b"a", b"b"], pages, storage)
+        storage.upload_bytes_and_get_url.assert_called_once_with(
+            b"png", extension="png", check_exists=False
+        )
+        assert groups == [([b"a", b"b"], [
+            pages[0], ({"text_lines": ["1"]}, "https://page/2.png")
+        ])]
+
+    def test_fit_inline_budget_splits_requests_without_storage(self):
+        storage = MagicMock(service_client=None)
+        pages = [({"text_lines": [str(i)]}, "data:image/png;base64,cG5n")
+                 for i in range(3)]
+        with patch("app.MAX_INLINE_REQUEST_BYTES", 60):
+            groups = _fit_inline_budget([b"a", b"b", b"c"], pages, storage)
+        assert groups == [([b"a", b"b"], pages[:2]), ([b"c"], pages[2:])]
+
+    @patch("openai_client.AzureConfig.get_openai_client")
+    def test_interpret_pages_attaches_inline_images(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(content="summary"))]
+        )
+        mock_get_client.return_value = mock_client
+
+        data_url = "data:image/png;base64,cG5n"
+        Interpreter().interpret_pages(
+            [({"caption": "c", "text_lines": ["t"]}, data_url)]
+        )
+        messages = mock_client.chat.completions.create.call_args.kwargs[
+            "messages"
+        ]
+        text_part, image_part = messages[1]["content"]
+        assert data_url not in text_part["text"]
+        assert image_part == {
+            "type": "image_url", "image_url": {"url": data_url}
+        }
+
+    @patch("app._prepare_page")
+    def test_summarize_pages_stops_when_cancelled(self, mock_prepare):
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with pytest.raises(CancelledError):
+            _summarize_pages(
+                iter([b"page"]), MagicMock(), MagicMock(), MagicMock(), None,
+                cancel_event=cancel_event
+            )
+        mock_prepare.assert_not_called()